@@ -2,23 +2,94 @@
 
 from __future__ import annotations
 
+import itertools
+import os
+import re
 import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
 
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from starlette.concurrency import run_in_threadpool
 
 from bms.config import MODEL_PATH
 from bms.domain import GameState, Reliever
 from bms.model_expected_runs import ExpectedRunsModel
 from bms.recommender import BullpenRecommender
-from .schemas import RecommendIn, RecommendOut, CandidateOut
-from .metrics import REQUESTS, LATENCY
+from .schemas import GameStateIn, RecommendIn, RecommendOut, RelieverIn
+from .metrics import latency_child, requests_child
+from .responses import ORJSONResponse
 
 
-app = FastAPI(title="Bullpen Management Simulator", version="0.1.0")
+# Request metrics can be switched off entirely with ENABLE_METRICS=0.
+ENABLE_METRICS = os.getenv("ENABLE_METRICS", "1") == "1"
+# Paths that are never observed: scrapes, probes and the docs would otherwise
+# feed back into the metrics they report.  Override via METRICS_EXCLUDED.
+METRICS_EXCLUDED = re.compile(
+    os.getenv("METRICS_EXCLUDED", r"^/(metrics|health|docs|redoc|openapi\.json)$")
+)
+# Observe latency for one in every METRICS_LATENCY_SAMPLE requests to bound
+# histogram update cost on high-QPS deployments.  Request counts are always
+# recorded.
+try:
+    METRICS_LATENCY_SAMPLE = max(1, int(os.getenv("METRICS_LATENCY_SAMPLE", "1")))
+except ValueError:
+    METRICS_LATENCY_SAMPLE = 1
+
+
+class PrometheusASGIMiddleware:
+    """Pure ASGI middleware to record request metrics.
+
+    Avoids the ``Request``/``Response`` allocations and body streaming that
+    ``BaseHTTPMiddleware`` (``@app.middleware("http")``) adds to every request.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self._counter = itertools.count()
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or METRICS_EXCLUDED.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        sampled = next(self._counter) % METRICS_LATENCY_SAMPLE == 0
+        start = time.perf_counter()
+
+        async def send_wrapper(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                duration = time.perf_counter() - start
+                # Label by route template rather than raw URL to keep the
+                # number of series bounded; unmatched paths share one label.
+                route = scope.get("route")
+                path = route.path if route is not None else "__unmatched__"
+                if sampled:
+                    latency_child(path).observe(duration)
+                requests_child(path, message["status"]).inc()
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm the model so the first request doesn't pay cold-start costs."""
+    if MODEL.pipe is not None:
+        MODEL.warmup()
+    yield
+
+
+app = FastAPI(
+    title="Bullpen Management Simulator",
+    version="0.1.0",
+    lifespan=lifespan,
+    # orjson encodes responses considerably faster than the stdlib json module
+    default_response_class=ORJSONResponse,
+)
 
 # Allow cross‑origin requests (UI runs on a different port)
 app.add_middleware(
@@ -27,32 +98,34 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if ENABLE_METRICS:
+    app.add_middleware(PrometheusASGIMiddleware)
 
-# Load the model once at startup
+# Load the model once at startup.  The artifact does not change while the
+# service runs, so whether it was loaded is recorded here rather than checked
+# on every health probe.
 MODEL = ExpectedRunsModel()
-if MODEL_PATH.exists():
+_MODEL_LOADED = MODEL_PATH.exists()
+if _MODEL_LOADED:
     MODEL.load(MODEL_PATH)
 RECO = BullpenRecommender(MODEL)
 
-
-@app.middleware("http")
-async def prometheus_middleware(request: Request, call_next: Any) -> Response:
-    """Middleware to record request metrics."""
-    start = time.perf_counter()
-    response = await call_next(request)
-    duration = time.perf_counter() - start
-    path = request.url.path
-    LATENCY.labels(endpoint=path).observe(duration)
-    REQUESTS.labels(endpoint=path, status=str(response.status_code)).inc()
-    return response
+# Domain fields supplied by each request schema, resolved once at import so
+# requests only copy attributes rather than dumping the Pydantic models
+_STATE_FIELDS = tuple(
+    f for f in GameState.__dataclass_fields__ if f in GameStateIn.model_fields
+)
+_RELIEVER_FIELDS = tuple(
+    f for f in Reliever.__dataclass_fields__ if f in RelieverIn.model_fields
+)
 
 
 @app.get("/health")
-def healthz() -> dict:
+async def healthz() -> dict:
     """Health check endpoint."""
     return {
         "status": "ok",
-        "model_loaded": MODEL_PATH.exists(),
+        "model_loaded": _MODEL_LOADED,
     }
 
 
@@ -62,13 +135,18 @@ def metrics() -> Response:
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
-@app.post("/recommend", response_model=RecommendOut)
-def recommend(payload: RecommendIn) -> RecommendOut:
+# RecommendOut documents the response in the OpenAPI schema only.  The
+# recommender output comes from trusted internal code, so it is encoded
+# directly instead of being validated again on the way out.
+@app.post("/recommend", responses={200: {"model": RecommendOut}})
+async def recommend(payload: RecommendIn) -> ORJSONResponse:
     """Recommend a reliever based on current game state and bullpen options."""
     state_in = payload.state
-    state = GameState(**state_in.model_dump())
-    bullpen = [Reliever(**r.model_dump()) for r in payload.bullpen]
-    result = RECO.recommend(state, bullpen)
-    # Convert candidates into typed objects for response validation
-    result["candidates"] = [CandidateOut(**c) for c in result["candidates"]]
-    return RecommendOut(**result)
\ No newline at end of file
+    state = GameState(**{k: getattr(state_in, k) for k in _STATE_FIELDS})
+    fields = _RELIEVER_FIELDS
+    bullpen = [
+        Reliever(**{k: getattr(r, k) for k in fields}) for r in payload.bullpen
+    ]
+    # Model inference is CPU bound; keep it off the event loop
+    result = await run_in_threadpool(RECO.recommend, state, bullpen)
+    return ORJSONResponse(result)
\ No newline at end of file
@@ -1,5 +1,7 @@
 """Prometheus metrics definitions for the BMS API."""
 
+from functools import lru_cache
+
 from prometheus_client import Counter, Histogram, Gauge
 
 # Count total requests by endpoint and status code
@@ -9,15 +11,32 @@ REQUESTS = Counter(
     ["endpoint", "status"],
 )
 
-# Measure request latency (seconds) per endpoint
+# Measure request latency (seconds) per endpoint.  Buckets are tuned to the
+# API's latency range rather than the prometheus_client defaults.
 LATENCY = Histogram(
     "bms_request_latency_seconds",
     "Latency of requests in seconds",
     ["endpoint"],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
 )
 
 # Gauge for tracking online model performance (mean absolute error)
 ONLINE_MAE = Gauge(
     "bms_online_mae",
     "Online mean absolute error over the most recent prediction window",
-)
\ No newline at end of file
+)
+
+
+# Labelled children resolved once per label set.  ``.labels()`` takes a lock
+# and a dict lookup on every call, which the middleware would otherwise pay
+# on each request.
+@lru_cache(maxsize=256)
+def latency_child(endpoint: str):
+    """Return the LATENCY child for an endpoint."""
+    return LATENCY.labels(endpoint=endpoint)
+
+
+@lru_cache(maxsize=256)
+def requests_child(endpoint: str, status: int):
+    """Return the REQUESTS child for an endpoint and status code."""
+    return REQUESTS.labels(endpoint=endpoint, status=str(status))
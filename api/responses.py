@@ -0,0 +1,20 @@
+"""Response classes for the BMS API."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from starlette.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson.
+
+    FastAPI's own ``ORJSONResponse`` is deprecated in favour of Pydantic
+    serialization through a response model.  ``/recommend`` deliberately skips
+    its response model, so the orjson encoder is kept here instead.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
@@ -8,7 +8,7 @@ used to select a reliever.
 
 from .config import K_BATTERS, MODEL_PATH
 from .domain import GameState, Reliever
-from .features import feature_df_from_events
+from .features import feature_array_from_state, feature_df_from_events
 from .model_expected_runs import ExpectedRunsModel
 from .recommender import BullpenRecommender
 
@@ -18,6 +18,7 @@ __all__ = [
     "ExpectedRunsModel",
     "BullpenRecommender",
     "feature_df_from_events",
+    "feature_array_from_state",
     "K_BATTERS",
     "MODEL_PATH",
 ]
\ No newline at end of file
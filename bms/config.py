@@ -23,4 +23,13 @@ MODEL_PATH = Path(os.getenv("MODEL_PATH", "models/bms.joblib"))
 try:
     K_BATTERS = int(os.getenv("K_BATTERS", "3"))
 except ValueError:
-    K_BATTERS = 3
\ No newline at end of file
+    K_BATTERS = 3
+
+# Maximum number of predictions memoized by ExpectedRunsModel.predict_array on
+# the serving path.  Game states repeat heavily across requests, so most
+# candidate rows can be answered without running the model.  Set the
+# PREDICT_CACHE_SIZE environment variable to 0 to disable the cache.
+try:
+    PREDICT_CACHE_SIZE = int(os.getenv("PREDICT_CACHE_SIZE", "65536"))
+except ValueError:
+    PREDICT_CACHE_SIZE = 65536
@@ -2,7 +2,8 @@
 
 This module defines the data classes used to represent the state of the game and
 the relievers under consideration.  These classes are lightweight and
-serializable, making them suitable for API payloads.
+serializable, making them suitable for API payloads.  They use ``__slots__``
+so the per-request instances (one per reliever) carry no ``__dict__``.
 """
 
 from __future__ import annotations
@@ -17,7 +18,7 @@ from typing import Literal
 Runners = Literal["---", "1--", "-2-", "--3", "12-", "1-3", "-23", "123"]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GameState:
     """Representation of the game context when choosing a reliever.
 
@@ -58,7 +59,7 @@ class GameState:
     leverage_hint: float | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Reliever:
     """Representation of a relief pitcher.
 
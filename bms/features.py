@@ -9,8 +9,11 @@ environment.
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+from .domain import GameState, Reliever
+
 
 # Map each base/out encoding to the number of runners on base.  This is a
 # coarse representation of traffic on the bases.  Additional features (such
@@ -26,6 +29,38 @@ RUNNER_MAP = {
     "123": 3,
 }
 
+# RUNNER_MAP frozen into an index and an aligned lookup array, so encoding the
+# runners column is a single vectorized gather instead of a per-row dict
+# lookup.
+_RUNNER_INDEX = pd.Index(list(RUNNER_MAP))
+_RUNNER_CODES = np.array(list(RUNNER_MAP.values()), dtype=np.int8)
+
+# Handedness most likely to bat next for each lineup segment.  This is a
+# placeholder until batter handedness is available in the game state.
+SEGMENT_BATS = {1: "L", 2: "R", 3: "R"}
+
+# Categorical and numeric feature names used by the feature builder
+CAT = ["park_id", "batter_segment"]
+NUM = [
+    "outs",
+    "runners_on",
+    "inning",
+    "close_game",
+    "late_inning",
+    "platoon",
+    "rest_days",
+    "fatigued",
+    "home",
+    "leverage_proxy",
+]
+# Column order of the matrix consumed by the model: categoricals first
+FEATURES = CAT + NUM
+
+# Positions of the reliever-specific columns in FEATURES
+_PLATOON = FEATURES.index("platoon")
+_REST_DAYS = FEATURES.index("rest_days")
+_FATIGUED = FEATURES.index("fatigued")
+
 
 def feature_df_from_events(df: pd.DataFrame) -> pd.DataFrame:
     """Convert a DataFrame of event data into a feature matrix.
@@ -49,33 +84,103 @@ def feature_df_from_events(df: pd.DataFrame) -> pd.DataFrame:
     model pipeline.
     """
 
-    out = pd.DataFrame(index=df.index)
-    # Outs (0‒2)
-    out["outs"] = df["outs"].astype(int).clip(0, 2)
-    # Number of runners on base (0‒3)
-    out["runners_on"] = df["runners"].map(RUNNER_MAP).fillna(0).astype(int)
-    # Inning number
-    out["inning"] = df["inning"].astype(int)
-    # Close game indicator: absolute score diff <= 1
-    out["close_game"] = (df["score_diff"].abs() <= 1).astype(int)
-    # Late inning indicator: inning >= 7
-    out["late_inning"] = (df["inning"] >= 7).astype(int)
-    # Platoon advantage: 1 if favourable, 0 otherwise
-    out["platoon"] = df.get("platoon", 0).astype(int)
-    # Days of rest (capped at 5 to avoid outliers)
-    out["rest_days"] = df["rest_days"].astype(int).clip(0, 5)
-    # Fatigue indicator: 1 if last outing had >20 pitches
-    out["fatigued"] = (df["pitches_last_outing"] > 20).astype(int)
-    # Home indicator (1 for home, 0 for away)
-    out["home"] = df["home"].astype(int)
-    # Categorical park identifier
-    out["park_id"] = df["park_id"].astype(int)
-    # Categorical batter segment (1, 2 or 3)
-    out["batter_segment"] = df["batter_segment"].astype(int)
+    # Pull each input column out once as an ndarray and derive every feature
+    # directly from those, rather than materializing intermediate Series.
+    # Numeric features are float32 (ample precision for tree splits, half the
+    # memory of float64 for large training frames); the categorical
+    # identifiers are int32.
+    f32 = np.float32
+    outs = np.clip(df["outs"].to_numpy(f32), 0, 2)
+    # Unknown runner encodings get code -1 and are treated as empty bases
+    codes = _RUNNER_INDEX.get_indexer(df["runners"])
+    runners_on = _RUNNER_CODES[np.where(codes >= 0, codes, 0)].astype(f32)
+    inning = df["inning"].to_numpy(f32)
+    if "platoon" in df:
+        platoon = df["platoon"].to_numpy(f32)
+    else:
+        platoon = np.zeros(len(df), dtype=f32)
+    rest_days = np.clip(df["rest_days"].to_numpy(f32), 0, 5)
+
+    # Indicators: close game (|score diff| <= 1), late inning (7th or later),
+    # fatigue (more than 20 pitches last outing) and heavy traffic on base
+    close_game = (np.abs(df["score_diff"].to_numpy()) <= 1).astype(f32)
+    late_inning = (inning >= 7).astype(f32)
+    fatigued = (df["pitches_last_outing"].to_numpy() > 20).astype(f32)
+    traffic = (runners_on >= 2).astype(f32)
+
     # Simple leverage proxy combining closeness, lateness and traffic on base
-    out["leverage_proxy"] = (
-        out["late_inning"] * 0.7
-        + out["close_game"] * 0.6
-        + (out["runners_on"] >= 2).astype(int) * 0.5
+    leverage_proxy = (
+        f32(0.7) * late_inning + f32(0.6) * close_game + f32(0.5) * traffic
+    )
+
+    return pd.DataFrame(
+        {
+            "outs": outs,
+            "runners_on": runners_on,
+            "inning": inning,
+            "close_game": close_game,
+            "late_inning": late_inning,
+            "platoon": platoon,
+            "rest_days": rest_days,
+            "fatigued": fatigued,
+            "home": df["home"].to_numpy(f32),
+            # Categorical identifiers
+            "park_id": df["park_id"].to_numpy(np.int32),
+            "batter_segment": df["batter_segment"].to_numpy(np.int32),
+            "leverage_proxy": leverage_proxy,
+        },
+        index=df.index,
+        copy=False,
+    )
+
+
+def feature_array_from_state(state: GameState, bullpen: list[Reliever]) -> np.ndarray:
+    """Build the feature matrix for scoring a bullpen in a single game state.
+
+    This is the inference-time counterpart of :func:`feature_df_from_events`.
+    It computes the same features without going through pandas, writing them
+    into a preallocated float64 array of shape ``(len(bullpen),
+    len(FEATURES))`` with columns ordered as ``FEATURES``.  If the state
+    carries a ``leverage_hint`` it replaces the computed leverage proxy.
+
+    The array is float64 because that is what the regressor consumes; a
+    float32 array would only be upcast again inside ``predict``.  The leverage
+    proxy is still computed in float32 so its values match the training frame
+    exactly.
+    """
+    f32 = np.float32
+    runners_on = RUNNER_MAP.get(state.runners, 0)
+    close_game = abs(state.score_diff) <= 1
+    late_inning = state.inning >= 7
+    if state.leverage_hint is not None:
+        leverage_proxy = f32(state.leverage_hint)
+    else:
+        leverage_proxy = (
+            f32(0.7) * late_inning
+            + f32(0.6) * close_game
+            + f32(0.5) * (runners_on >= 2)
+        )
+
+    X = np.empty((len(bullpen), len(FEATURES)), dtype=np.float64)
+    # Game-state columns are identical for every reliever; the reliever
+    # columns (platoon, rest_days, fatigued) are filled in below.
+    X[:] = (
+        state.park_id,
+        state.batter_segment,
+        min(max(state.outs, 0), 2),
+        runners_on,
+        state.inning,
+        close_game,
+        late_inning,
+        0,
+        0,
+        0,
+        state.home,
+        leverage_proxy,
     )
-    return out
\ No newline at end of file
+    bats = SEGMENT_BATS.get(state.batter_segment)
+    for i, r in enumerate(bullpen):
+        X[i, _PLATOON] = r.throws == bats
+        X[i, _REST_DAYS] = min(max(r.rest_days, 0), 5)
+        X[i, _FATIGUED] = r.pitches_last_outing > 20
+    return X
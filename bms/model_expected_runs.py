@@ -2,69 +2,149 @@
 
 This module defines a thin wrapper around a scikit‑learn regression pipeline.
 The model predicts the expected runs allowed over the next ``K`` batters given
-features derived from the game state and reliever attributes.  Gradient
-Boosting Regressor is chosen as a strong baseline for tabular data.
+features derived from the game state and reliever attributes.  Histogram
+Gradient Boosting Regressor is chosen as a strong, fast baseline for tabular
+data.
 """
 
 from __future__ import annotations
 
+import copy
+import os
+import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
 import joblib
+import numpy as np
 import pandas as pd
-from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import OneHotEncoder
 from sklearn.pipeline import Pipeline
-from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor
 from sklearn.metrics import mean_absolute_error
 
+from .config import PREDICT_CACHE_SIZE
+from .domain import GameState, Reliever
+from .features import CAT, FEATURES, feature_array_from_state
+# NUM moved to bms.features along with CAT; it remains importable from here
+from .features import NUM  # noqa: F401
 
-# Categorical and numeric feature names used by the feature builder
-CAT = ["park_id", "batter_segment"]
-NUM = [
-    "outs",
-    "runners_on",
-    "inning",
-    "close_game",
-    "late_inning",
-    "platoon",
-    "rest_days",
-    "fatigued",
-    "home",
-    "leverage_proxy",
-]
+
+# Largest categorical identifier covered by a dense codebook.  Models fitted on
+# larger identifiers fall back to the regressor's own encoder.
+_MAX_CODEBOOK_ID = 1 << 16
+
+
+def _matrix(X: pd.DataFrame) -> np.ndarray:
+    """Return the feature columns of ``X`` as a float64 matrix in model order.
+
+    HistGradientBoostingRegressor validates its input as float64, so handing
+    it float32 would only add a conversion inside ``fit`` and ``predict``.
+    """
+    return X[FEATURES].to_numpy(dtype=np.float64)
 
 
 class ExpectedRunsModel:
     """Regression model for expected runs.
 
-    The model encapsulates a scikit‑learn pipeline composed of a column
-    transformer (for one‑hot encoding categorical variables) and a gradient
-    boosting regressor.  It exposes convenience methods for training,
-    predicting, evaluating and persisting the model.
+    The model encapsulates a scikit‑learn pipeline wrapping a histogram
+    gradient boosting regressor that splits on the categorical columns
+    natively.  Features are passed to the pipeline as a float64 matrix with
+    columns ordered as ``FEATURES``.  It exposes convenience methods for
+    training, predicting, evaluating and persisting the model.
+
+    Parameters
+    ----------
+    cache_size: int
+        Maximum number of rows memoized by :meth:`predict_array`.  ``0``
+        disables the cache.  Defaults to ``PREDICT_CACHE_SIZE``.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, cache_size: int = PREDICT_CACHE_SIZE) -> None:
         self.pipe: Pipeline | None = None
+        self.cache_size = cache_size
+        # LRU cache of predictions keyed by the packed bytes of a feature row
+        self._cache: OrderedDict[bytes, float] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Fixed-schema serving path built by _freeze() after fit or load
+        self._codebooks: list[np.ndarray] | None = None
+        self._serving: HistGradientBoostingRegressor | None = None
 
     def _pipeline(self) -> Pipeline:
-        # Preprocess categorical columns with one‑hot encoding and pass
-        # numeric columns through unchanged.  Unknown categories are ignored.
-        preprocessor = ColumnTransformer(
-            transformers=[
-                ("cat", OneHotEncoder(handle_unknown="ignore"), CAT),
-                ("num", "passthrough", NUM),
-            ]
-        )
-        # Gradient boosting regressor parameters chosen for a balance of bias
-        # and variance.  They can be tuned via the training script.
-        model = GradientBoostingRegressor(
-            n_estimators=300,
+        # Histogram gradient boosting evaluates trees in compiled code, which
+        # keeps per-request inference latency low.  Parameters are chosen for
+        # a balance of bias and variance and can be tuned via the training
+        # script.  Categorical columns lead the feature matrix, so they are
+        # identified by position; categories unseen during fit are treated
+        # as missing.
+        model = HistGradientBoostingRegressor(
+            max_iter=300,
             learning_rate=0.05,
             max_depth=3,
-            subsample=0.9,
+            categorical_features=list(range(len(CAT))),
             random_state=42,
         )
-        return Pipeline([("pre", preprocessor), ("model", model)])
+        return Pipeline([("model", model)])
+
+    def _freeze(self) -> None:
+        """Prepare the fixed-schema serving path for the current pipeline.
+
+        With ``categorical_features`` set, the regressor runs every ``predict``
+        through an internal preprocessor: a ``ColumnTransformer`` applying an
+        ``OrdinalEncoder`` to the categorical columns and ``check_array`` to
+        the rest.  Here the fitted categories are frozen into dense lookup
+        arrays (identifier -> ordinal code, unknown -> NaN, as the encoder
+        does), and a shallow copy of the regressor without the preprocessor is
+        kept for serving.  Whenever the pipeline does not have the expected
+        shape, serving falls back to ``self.pipe.predict``.
+        """
+        assert self.pipe is not None
+        self._cache.clear()
+        self._codebooks = None
+        self._serving = None
+        est = self.pipe[-1]
+        pre = getattr(est, "_preprocessor", None)
+        # Only a bare regressor whose encoded columns are the leading CAT
+        # columns keeps its column order through the preprocessor
+        if len(self.pipe) != 1 or pre is None:
+            return
+        leading = np.arange(len(FEATURES)) < len(CAT)
+        if not np.array_equal(getattr(est, "is_categorical_", None), leading):
+            return
+        codebooks = []
+        for categories in pre.named_transformers_["encoder"].categories_:
+            categories = categories[~np.isnan(categories)]
+            ids = categories.astype(np.intp)
+            if (
+                not ids.size
+                or (ids != categories).any()
+                or ids.min() < 0
+                or ids.max() > _MAX_CODEBOOK_ID
+            ):
+                return
+            lut = np.full(ids.max() + 1, np.nan)
+            lut[ids] = np.arange(ids.size)
+            codebooks.append(lut)
+        serving = copy.copy(est)
+        serving._preprocessor = None
+        self._codebooks = codebooks
+        self._serving = serving
+
+    def _encode(self, M: np.ndarray) -> np.ndarray:
+        """Replace the categorical identifiers in ``M`` with ordinal codes."""
+        X = M.copy()
+        for j, lut in enumerate(self._codebooks):
+            col = M[:, j]
+            # NaN compares false, so missing values stay missing
+            in_range = (col >= 0) & (col < lut.size)
+            ids = np.where(in_range, col, 0).astype(np.intp)
+            X[:, j] = np.where(in_range & (ids == col), lut[ids], np.nan)
+        return X
+
+    def _serve(self, M: np.ndarray) -> np.ndarray:
+        """Score a feature matrix on the fixed-schema serving path."""
+        if self._serving is None:
+            return self.pipe.predict(M)
+        return self._serving.predict(self._encode(M))
 
     def fit(self, X: pd.DataFrame, y: pd.Series) -> None:
         """Fit the model on the provided features and target.
@@ -78,7 +158,8 @@ class ExpectedRunsModel:
             ``K`` batters.  The caller is responsible for deriving this label.
         """
         self.pipe = self._pipeline()
-        self.pipe.fit(X, y)
+        self.pipe.fit(_matrix(X), y)
+        self._freeze()
 
     def predict(self, X: pd.DataFrame) -> pd.Series:
         """Predict expected runs for the provided feature matrix.
@@ -89,18 +170,107 @@ class ExpectedRunsModel:
             Predicted expected runs for each observation.
         """
         assert self.pipe is not None, "Model has not been trained or loaded"
-        return pd.Series(self.pipe.predict(X), index=X.index)
+        return pd.Series(self.pipe.predict(_matrix(X)), index=X.index)
+
+    def predict_array(self, X: pd.DataFrame) -> np.ndarray:
+        """Predict expected runs, returning the raw array of predictions.
+
+        Skips the index-aligned ``pd.Series`` returned by :meth:`predict` and
+        shares the prediction cache of :meth:`predict_raw`.
+        """
+        return self.predict_raw(_matrix(X))
+
+    def predict_raw(self, M: np.ndarray) -> np.ndarray:
+        """Predict expected runs from a prepared float64 feature matrix.
+
+        ``M`` must have its columns ordered as ``FEATURES``, as produced by
+        :func:`bms.features.feature_array_from_state`.  This is the serving
+        path: no pandas objects are involved, categorical columns are encoded
+        with the codebooks frozen by :meth:`_freeze`, and predictions are
+        memoized per feature row so only rows missing from the cache reach
+        the model.
+        """
+        assert self.pipe is not None, "Model has not been trained or loaded"
+        if not self.cache_size:
+            return self._serve(M)
+        keys = [row.tobytes() for row in M]
+        preds = np.empty(len(keys))
+        misses = []
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                hit = self._cache.get(key)
+                if hit is None:
+                    misses.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    preds[i] = hit
+        if misses:
+            preds[misses] = self._serve(M[misses])
+            with self._cache_lock:
+                for i in misses:
+                    self._cache[keys[i]] = preds[i]
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return preds
 
     def evaluate_mae(self, X: pd.DataFrame, y: pd.Series) -> float:
         """Compute the mean absolute error of predictions on a validation set."""
         return float(mean_absolute_error(y, self.predict(X)))
 
     def save(self, path: Path) -> None:
-        """Persist the model pipeline to disk."""
+        """Persist the model pipeline to disk.
+
+        The artifact is written to a temporary file and atomically renamed
+        onto ``path``.  A running service that memory-mapped the previous
+        artifact keeps reading the old file rather than one rewritten under
+        it.
+        """
         assert self.pipe is not None, "Model has not been trained"
         path.parent.mkdir(parents=True, exist_ok=True)
-        joblib.dump(self.pipe, path)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        os.close(fd)
+        try:
+            joblib.dump(self.pipe, tmp)
+            # mkstemp creates the file 0600; give it the permissions a plain
+            # open() would have so other users can still read the artifact
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp, 0o666 & ~umask)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def load(self, path: Path, mmap_mode: str | None = "r") -> None:
+        """Load a persisted model pipeline from disk.
 
-    def load(self, path: Path) -> None:
-        """Load a persisted model pipeline from disk."""
-        self.pipe = joblib.load(path)
\ No newline at end of file
+        By default the arrays inside the artifact are memory-mapped read-only
+        rather than copied onto the heap, so forked workers share pages.
+        """
+        self.pipe = joblib.load(path, mmap_mode=mmap_mode)
+        self._freeze()
+
+    def warmup(self) -> None:
+        """Run a throwaway prediction to take cold-start costs off the first request.
+
+        The prediction goes through the serving path's feature builder to
+        trigger lazy imports and page in the model arrays.  The prediction
+        cache is bypassed so it stays empty.
+        """
+        assert self.pipe is not None, "Model has not been trained or loaded"
+        state = GameState(
+            outs=0,
+            runners="---",
+            inning=7,
+            score_diff=0,
+            home=True,
+            park_id=1,
+            batter_segment=1,
+        )
+        reliever = Reliever(
+            reliever_id="warmup",
+            throws="R",
+            rest_days=1,
+            pitches_last_outing=15,
+        )
+        self._serve(feature_array_from_state(state, [reliever]))
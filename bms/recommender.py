@@ -0,0 +1,87 @@
+"""Business logic for selecting a reliever.
+
+The recommender scores every available reliever with the expected runs model,
+adds usage penalties for rest and fatigue, and recommends the candidate with
+the lowest penalized expected runs.  All candidates are scored in a single
+batched model call on a NumPy feature matrix, so the pipeline overhead is paid
+once per request rather than once per reliever and pandas stays off the
+serving path.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from .domain import GameState, Reliever
+from .features import feature_array_from_state
+from .model_expected_runs import ExpectedRunsModel
+
+
+# Penalty (in runs) for a reliever who pitched the previous day.
+BACK_TO_BACK_PENALTY = 0.15
+# Penalty (in runs) for a reliever who threw more than 20 pitches last outing.
+FATIGUE_PENALTY = 0.10
+# Penalty applied to unavailable relievers.  Large enough to never be chosen
+# while staying finite so responses remain valid JSON.
+UNAVAILABLE_PENALTY = 1e6
+
+
+class BullpenRecommender:
+    """Recommend the reliever minimizing penalized expected runs.
+
+    Parameters
+    ----------
+    model: ExpectedRunsModel
+        Trained model used to predict expected runs for each candidate.
+    """
+
+    def __init__(self, model: ExpectedRunsModel) -> None:
+        self.model = model
+
+    @staticmethod
+    def _penalties(reliever: Reliever) -> dict[str, float]:
+        """Return the usage penalty components for a reliever."""
+        return {
+            "back_to_back": BACK_TO_BACK_PENALTY if reliever.rest_days == 0 else 0.0,
+            "fatigue": FATIGUE_PENALTY if reliever.pitches_last_outing > 20 else 0.0,
+            "unavailable": 0.0 if reliever.available else UNAVAILABLE_PENALTY,
+        }
+
+    def recommend(self, state: GameState, bullpen: list[Reliever]) -> dict[str, Any]:
+        """Score the bullpen and recommend a reliever.
+
+        Returns
+        -------
+        dict
+            ``recommendation`` (the best candidate), ``candidates`` (all
+            candidates sorted by penalized expected runs), ``explanations``
+            (penalty components per reliever) and the echoed ``state``.
+        """
+        if not bullpen:
+            return {
+                "recommendation": {},
+                "candidates": [],
+                "explanations": {},
+                "state": asdict(state),
+            }
+        # Score every candidate in one batched prediction
+        preds = self.model.predict_raw(feature_array_from_state(state, bullpen))
+        penalties = [self._penalties(r) for r in bullpen]
+        candidates = sorted(
+            (
+                {
+                    "reliever_id": r.reliever_id,
+                    "expected_runs": pred,
+                    "expected_runs_penalized": pred + sum(p.values()),
+                }
+                for r, pred, p in zip(bullpen, preds.tolist(), penalties)
+            ),
+            key=lambda c: c["expected_runs_penalized"],
+        )
+        return {
+            "recommendation": candidates[0],
+            "candidates": candidates,
+            "explanations": {r.reliever_id: p for r, p in zip(bullpen, penalties)},
+            "state": asdict(state),
+        }
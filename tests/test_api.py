@@ -0,0 +1,141 @@
+"""Tests for the request metrics recorded by the BMS API."""
+
+from __future__ import annotations
+
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+
+PAYLOAD = {
+    "state": {
+        "outs": 1,
+        "runners": "1-3",
+        "inning": 8,
+        "score_diff": 0,
+        "home": True,
+        "park_id": 2,
+        "batter_segment": 1,
+    },
+    "bullpen": [
+        {
+            "reliever_id": "a",
+            "throws": "L",
+            "rest_days": 1,
+            "pitches_last_outing": 12,
+        }
+    ],
+}
+
+
+class StubRecommender:
+    """Return a fixed recommendation without a trained model."""
+
+    def recommend(self, state, bullpen) -> dict:
+        candidate = {
+            "reliever_id": bullpen[0].reliever_id,
+            "expected_runs": 0.5,
+            "expected_runs_penalized": 0.5,
+        }
+        return {
+            "recommendation": candidate,
+            "candidates": [candidate],
+            "explanations": {},
+            "state": {},
+        }
+
+
+def _requests(endpoint: str, status: str = "200") -> float:
+    value = REGISTRY.get_sample_value(
+        "bms_requests_total", {"endpoint": endpoint, "status": status}
+    )
+    return value or 0.0
+
+
+def _observed(endpoint: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "bms_request_latency_seconds_count", {"endpoint": endpoint}
+    )
+    return value or 0.0
+
+
+@pytest.fixture
+def load_api(monkeypatch):
+    """Import api.main afresh with the given environment variables set."""
+    names: list[str] = []
+
+    def _load(**env: str):
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+            names.append(name)
+        import api.main
+
+        module = importlib.reload(api.main)
+        monkeypatch.setattr(module, "RECO", StubRecommender())
+        return module
+
+    yield _load
+    for name in names:
+        monkeypatch.delenv(name, raising=False)
+    import api.main
+
+    importlib.reload(api.main)
+
+
+def test_metrics_labelled_by_route_template(load_api) -> None:
+    module = load_api()
+
+    @module.app.get("/items/{item_id}")
+    async def item(item_id: int) -> dict:
+        return {"item_id": item_id}
+
+    client = TestClient(module.app)
+    before = _requests("/items/{item_id}")
+    assert client.get("/items/1").status_code == 200
+    assert client.get("/items/2").status_code == 200
+    assert _requests("/items/{item_id}") == before + 2
+    assert _requests("/items/1") == 0.0
+
+    before = _requests("/recommend")
+    assert client.post("/recommend", json=PAYLOAD).status_code == 200
+    assert _requests("/recommend") == before + 1
+
+
+def test_unmatched_paths_share_a_label(load_api) -> None:
+    client = TestClient(load_api().app)
+    before = _requests("__unmatched__", "404")
+    assert client.get("/no-such-path").status_code == 404
+    assert client.get("/another/missing/path").status_code == 404
+    assert _requests("__unmatched__", "404") == before + 2
+    assert _requests("/no-such-path", "404") == 0.0
+
+
+@pytest.mark.parametrize("path", ["/health", "/metrics", "/docs"])
+def test_excluded_paths_not_observed(load_api, path: str) -> None:
+    client = TestClient(load_api().app)
+    before = (_requests(path), _observed(path))
+    assert client.get(path).status_code == 200
+    assert (_requests(path), _observed(path)) == before
+
+
+def test_metrics_can_be_disabled(load_api) -> None:
+    module = load_api(ENABLE_METRICS="0")
+    middleware = [m.cls for m in module.app.user_middleware]
+    assert module.PrometheusASGIMiddleware not in middleware
+
+    client = TestClient(module.app)
+    before = (_requests("/recommend"), _observed("/recommend"))
+    assert client.post("/recommend", json=PAYLOAD).status_code == 200
+    assert (_requests("/recommend"), _observed("/recommend")) == before
+
+
+def test_latency_sampled_while_counts_exact(load_api) -> None:
+    client = TestClient(load_api(METRICS_LATENCY_SAMPLE="3").app)
+    before = (_requests("/recommend"), _observed("/recommend"))
+    for _ in range(7):
+        assert client.post("/recommend", json=PAYLOAD).status_code == 200
+    assert _requests("/recommend") == before[0] + 7
+    # Requests 1, 4 and 7 are observed
+    assert _observed("/recommend") == before[1] + 3
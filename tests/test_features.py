@@ -0,0 +1,71 @@
+"""Tests for the feature builders in :mod:`bms.features`."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bms.domain import GameState, Reliever
+from bms.features import (
+    FEATURES,
+    SEGMENT_BATS,
+    feature_array_from_state,
+    feature_df_from_events,
+)
+
+
+BULLPEN = [
+    Reliever("lefty", "L", rest_days=0, pitches_last_outing=25),
+    Reliever("righty", "R", rest_days=2, pitches_last_outing=20),
+    Reliever("tired", "R", rest_days=9, pitches_last_outing=21),
+    Reliever("unavailable", "L", rest_days=3, pitches_last_outing=0, available=False),
+]
+
+
+def _events(state: GameState, bullpen: list[Reliever]) -> pd.DataFrame:
+    """Build the event rows the training path would see for this bullpen."""
+    bats = SEGMENT_BATS.get(state.batter_segment)
+    return pd.DataFrame(
+        {
+            "outs": [state.outs] * len(bullpen),
+            "runners": [state.runners] * len(bullpen),
+            "inning": [state.inning] * len(bullpen),
+            "score_diff": [state.score_diff] * len(bullpen),
+            "platoon": [int(r.throws == bats) for r in bullpen],
+            "rest_days": [r.rest_days for r in bullpen],
+            "pitches_last_outing": [r.pitches_last_outing for r in bullpen],
+            "home": [int(state.home)] * len(bullpen),
+            "park_id": [state.park_id] * len(bullpen),
+            "batter_segment": [state.batter_segment] * len(bullpen),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "state",
+    [
+        GameState(0, "---", 1, 5, False, 0, 1),
+        GameState(1, "1-3", 8, 0, True, 3, 2),
+        GameState(2, "123", 7, -1, True, 12, 3),
+        # Out-of-range outs are clipped, unknown runner encodings count as empty
+        GameState(3, "???", 9, 1, False, 7, 1),
+        GameState(-1, "12-", 12, -4, True, 29, 2),
+    ],
+)
+def test_feature_array_matches_feature_df(state: GameState) -> None:
+    expected = feature_df_from_events(_events(state, BULLPEN))[FEATURES]
+    actual = feature_array_from_state(state, BULLPEN)
+    assert actual.dtype == np.float64
+    np.testing.assert_array_equal(actual, expected.to_numpy(np.float64))
+
+
+def test_feature_array_uses_leverage_hint() -> None:
+    state = GameState(1, "-2-", 6, 3, True, 4, 2, leverage_hint=2.5)
+    X = feature_array_from_state(state, BULLPEN)
+    np.testing.assert_array_equal(X[:, FEATURES.index("leverage_proxy")], 2.5)
+
+
+def test_feature_array_empty_bullpen() -> None:
+    state = GameState(0, "---", 1, 0, True, 1, 1)
+    assert feature_array_from_state(state, []).shape == (0, len(FEATURES))
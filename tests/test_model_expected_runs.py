@@ -0,0 +1,156 @@
+"""Tests for :class:`bms.model_expected_runs.ExpectedRunsModel`."""
+
+from __future__ import annotations
+
+import os
+import stat
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bms.features import FEATURES, feature_df_from_events
+from bms.model_expected_runs import ExpectedRunsModel
+
+
+def _training_data(n: int = 200) -> tuple[pd.DataFrame, pd.Series]:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "outs": rng.integers(0, 3, size=n),
+            "runners": rng.choice(["---", "1--", "-23", "123"], size=n),
+            "inning": rng.integers(1, 10, size=n),
+            "score_diff": rng.integers(-3, 4, size=n),
+            "platoon": rng.integers(0, 2, size=n),
+            "rest_days": rng.integers(0, 4, size=n),
+            "pitches_last_outing": rng.integers(5, 35, size=n),
+            "home": rng.integers(0, 2, size=n),
+            "park_id": rng.integers(1, 4, size=n),
+            "batter_segment": rng.integers(1, 4, size=n),
+        }
+    )
+    return feature_df_from_events(df), pd.Series(rng.normal(size=n))
+
+
+class _CountingPredict:
+    """Wrap a predict function and record the number of rows it receives."""
+
+    def __init__(self, predict) -> None:
+        self.predict = predict
+        self.rows: list[int] = []
+
+    def __call__(self, X: np.ndarray) -> np.ndarray:
+        self.rows.append(len(X))
+        return self.predict(X)
+
+
+@pytest.fixture
+def fitted() -> tuple[ExpectedRunsModel, np.ndarray]:
+    X, y = _training_data()
+    model = ExpectedRunsModel(cache_size=16)
+    model.fit(X, y)
+    return model, X[FEATURES].to_numpy(np.float64)
+
+
+def _spy(model: ExpectedRunsModel, monkeypatch: pytest.MonkeyPatch) -> _CountingPredict:
+    spy = _CountingPredict(model._serve)
+    monkeypatch.setattr(model, "_serve", spy)
+    return spy
+
+
+def test_cached_rows_skip_the_model(fitted, monkeypatch) -> None:
+    model, M = fitted
+    spy = _spy(model, monkeypatch)
+    first = model.predict_raw(M[:3])
+    again = model.predict_raw(M[:3])
+    np.testing.assert_array_equal(first, again)
+    assert spy.rows == [3]
+    # Only the row missing from the cache reaches the model
+    model.predict_raw(M[:4])
+    assert spy.rows == [3, 1]
+
+
+def test_cached_predictions_match_uncached(fitted) -> None:
+    model, M = fitted
+    model.predict_raw(M[:5])
+    np.testing.assert_allclose(model.predict_raw(M[:10]), model.pipe.predict(M[:10]))
+
+
+def test_cache_evicts_least_recently_used(fitted, monkeypatch) -> None:
+    model, M = fitted
+    model.cache_size = 2
+    spy = _spy(model, monkeypatch)
+    model.predict_raw(M[:2])
+    model.predict_raw(M[:1])  # refresh row 0 so row 1 is the oldest
+    model.predict_raw(M[2:3])
+    assert len(model._cache) == 2
+    model.predict_raw(M[:1])
+    assert spy.rows == [2, 1]
+    model.predict_raw(M[1:2])
+    assert spy.rows == [2, 1, 1]
+
+
+def test_zero_cache_size_bypasses_cache(fitted, monkeypatch) -> None:
+    model, M = fitted
+    model.cache_size = 0
+    spy = _spy(model, monkeypatch)
+    model.predict_raw(M[:3])
+    model.predict_raw(M[:3])
+    assert spy.rows == [3, 3]
+    assert not model._cache
+
+
+def test_fit_and_load_clear_cache(fitted, tmp_path) -> None:
+    model, M = fitted
+    path = tmp_path / "bms.joblib"
+    model.save(path)
+
+    model.predict_raw(M[:3])
+    assert model._cache
+    model.load(path)
+    assert not model._cache
+
+    model.predict_raw(M[:3])
+    model.fit(*_training_data(100))
+    assert not model._cache
+
+
+def test_serving_path_matches_pipeline(fitted, monkeypatch) -> None:
+    model, M = fitted
+    assert model._serving is not None
+    model.cache_size = 0
+    rows = M[:6].copy()
+    # Unseen park IDs inside and beyond the codebook, and an unseen segment
+    rows[0, FEATURES.index("park_id")] = 0
+    rows[1, FEATURES.index("park_id")] = 99
+    rows[2, FEATURES.index("park_id")] = 10**9
+    rows[3, FEATURES.index("batter_segment")] = 7
+    rows[4, FEATURES.index("park_id")] = np.nan
+    expected = model.pipe.predict(rows)
+
+    # The regressor's own encoder must not run on the serving path
+    preprocessor = model.pipe[-1]._preprocessor
+    monkeypatch.setattr(preprocessor, "transform", None)
+    np.testing.assert_allclose(model.predict_raw(rows), expected)
+
+
+def test_serving_path_survives_save_and_load(fitted, tmp_path) -> None:
+    model, M = fitted
+    path = tmp_path / "bms.joblib"
+    model.save(path)
+    loaded = ExpectedRunsModel(cache_size=0)
+    loaded.load(path)
+    assert loaded._serving is not None
+    np.testing.assert_allclose(loaded.predict_raw(M[:8]), model.pipe.predict(M[:8]))
+
+
+def test_save_respects_umask(fitted, tmp_path) -> None:
+    model, _ = fitted
+    path = tmp_path / "bms.joblib"
+    previous = os.umask(0o022)
+    try:
+        model.save(path)
+    finally:
+        os.umask(previous)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+    assert list(tmp_path.iterdir()) == [path]
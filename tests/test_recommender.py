@@ -0,0 +1,110 @@
+"""Tests for :class:`bms.recommender.BullpenRecommender`."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+
+import numpy as np
+import pytest
+
+from bms.domain import GameState, Reliever
+from bms.features import FEATURES
+from bms.recommender import (
+    BACK_TO_BACK_PENALTY,
+    FATIGUE_PENALTY,
+    UNAVAILABLE_PENALTY,
+    BullpenRecommender,
+)
+
+
+STATE = GameState(1, "1-3", 8, 0, True, 2, 1)
+
+
+class StubModel:
+    """Return fixed expected runs per reliever, in bullpen order."""
+
+    def __init__(self, runs: list[float]) -> None:
+        self.runs = runs
+        self.calls: list[np.ndarray] = []
+
+    def predict_raw(self, M: np.ndarray) -> np.ndarray:
+        self.calls.append(M)
+        return np.asarray(self.runs[: len(M)], dtype=np.float64)
+
+
+def _recommend(bullpen: list[Reliever], runs: list[float]) -> dict:
+    return BullpenRecommender(StubModel(runs)).recommend(STATE, bullpen)
+
+
+def test_candidates_sorted_by_penalized_runs() -> None:
+    bullpen = [
+        Reliever("a", "R", rest_days=2, pitches_last_outing=10),
+        Reliever("b", "R", rest_days=2, pitches_last_outing=10),
+        Reliever("c", "L", rest_days=2, pitches_last_outing=10),
+    ]
+    result = _recommend(bullpen, [0.9, 0.3, 0.6])
+    penalized = [c["expected_runs_penalized"] for c in result["candidates"]]
+    assert [c["reliever_id"] for c in result["candidates"]] == ["b", "c", "a"]
+    assert penalized == sorted(penalized)
+    assert result["recommendation"] == result["candidates"][0]
+
+
+def test_bullpen_scored_in_one_call() -> None:
+    model = StubModel([0.5, 0.4])
+    bullpen = [
+        Reliever("a", "R", rest_days=1, pitches_last_outing=10),
+        Reliever("b", "L", rest_days=1, pitches_last_outing=10),
+    ]
+    BullpenRecommender(model).recommend(STATE, bullpen)
+    assert len(model.calls) == 1
+    assert model.calls[0].shape == (2, len(FEATURES))
+
+
+def test_unavailable_reliever_never_recommended() -> None:
+    bullpen = [
+        Reliever("closer", "R", rest_days=3, pitches_last_outing=0, available=False),
+        Reliever("mopup", "L", rest_days=0, pitches_last_outing=30),
+    ]
+    # The unavailable reliever has far lower raw expected runs
+    result = _recommend(bullpen, [0.0, 5.0])
+    assert result["recommendation"]["reliever_id"] == "mopup"
+    assert result["candidates"][-1]["reliever_id"] == "closer"
+    assert result["explanations"]["closer"]["unavailable"] == UNAVAILABLE_PENALTY
+
+
+@pytest.mark.parametrize(
+    ("rest_days", "pitches", "back_to_back", "fatigue"),
+    [
+        (0, 10, BACK_TO_BACK_PENALTY, 0.0),
+        (1, 21, 0.0, FATIGUE_PENALTY),
+        (0, 25, BACK_TO_BACK_PENALTY, FATIGUE_PENALTY),
+        (2, 20, 0.0, 0.0),
+    ],
+)
+def test_usage_penalties(
+    rest_days: int, pitches: int, back_to_back: float, fatigue: float
+) -> None:
+    bullpen = [Reliever("a", "R", rest_days=rest_days, pitches_last_outing=pitches)]
+    result = _recommend(bullpen, [0.5])
+    assert result["explanations"]["a"] == {
+        "back_to_back": back_to_back,
+        "fatigue": fatigue,
+        "unavailable": 0.0,
+    }
+    candidate = result["candidates"][0]
+    assert candidate["expected_runs"] == 0.5
+    assert candidate["expected_runs_penalized"] == pytest.approx(
+        0.5 + back_to_back + fatigue
+    )
+
+
+def test_empty_bullpen() -> None:
+    model = StubModel([])
+    result = BullpenRecommender(model).recommend(STATE, [])
+    assert result == {
+        "recommendation": {},
+        "candidates": [],
+        "explanations": {},
+        "state": asdict(STATE),
+    }
+    assert not model.calls